@@ -3,11 +3,41 @@
 // добавлять новые и редактировать информацию о филиалах.
 // Структура соответствует таблице branches в БД.
 
-import { Fragment, useEffect, useState, useRef, useCallback } from "react";
+import { Fragment, useEffect, useMemo, useState, useRef, useCallback } from "react";
 import * as XLSX from "xlsx";
 import { supabase } from "./supabaseClient";
 import { normalizeSearchText } from "./searchUtils";
 
+// Ширины колонок Excel-выгрузки статичны — собираем массив один раз.
+const BRANCHES_EXPORT_COL_WIDTHS = [
+  { wch: 36 },   // ID
+  { wch: 25 },   // Название
+  { wch: 20 },   // Клиент 1 порядка
+  { wch: 15 },   // Город
+  { wch: 20 },   // Ответственный
+  { wch: 40 },   // Стратегический план
+  { wch: 12 },   // ДР Филиала
+  { wch: 12 },   // Дата посещения
+  { wch: 15 },   // Торговый зал
+  { wch: 20 },   // Обучение
+  { wch: 20 },   // Директор
+  { wch: 10 },   // НС РП
+  { wch: 10 },   // НС ОП
+  { wch: 10 },   // НС КП
+  { wch: 10 },   // НС СМО
+  { wch: 10 },   // МПП
+  { wch: 20 },   // ТОП клиенты SDS
+  { wch: 20 },   // ТОП клиенты по филиалу
+  { wch: 20 },   // Мероприятия
+  { wch: 20 },   // Новинки
+  { wch: 20 },   // Каталоги/образцы
+  { wch: 30 },   // Комментарии
+  { wch: 20 },   // Информация к задаче
+  { wch: 10 },   // Количество клиентов
+  { wch: 18 },   // Дата создания
+  { wch: 18 },   // Дата обновления
+];
+
 // Локальные компоненты UI (аналогичные Clients.jsx)
 function Wrap({ children }) {
   return (
@@ -633,34 +663,34 @@ function Filters({ filters, onFilterChange, cities, primaryClients, users, getUs
 }
 
 // Вспомогательные функции
+// Форматтеры создаются один раз: toLocaleDateString с объектом опций
+// строит новый Intl.DateTimeFormat на каждый вызов.
+const dateOnlyFormatter = new Intl.DateTimeFormat("ru-RU", {
+  day: "2-digit",
+  month: "2-digit",
+  year: "numeric",
+});
+
+const dateTimeFormatter = new Intl.DateTimeFormat("ru-RU", {
+  day: "2-digit",
+  month: "2-digit",
+  year: "numeric",
+  hour: "2-digit",
+  minute: "2-digit",
+});
+
 function formatDate(dateString) {
   if (!dateString) return "не указан";
-  try {
-    const date = new Date(dateString);
-    return date.toLocaleDateString('ru-RU', {
-      day: '2-digit',
-      month: '2-digit',
-      year: 'numeric',
-    });
-  } catch (e) {
-    return dateString;
-  }
+  const date = new Date(dateString);
+  if (Number.isNaN(date.getTime())) return dateString;
+  return dateOnlyFormatter.format(date);
 }
 
 function formatDateTime(dateString) {
   if (!dateString) return "не указан";
-  try {
-    const date = new Date(dateString);
-    return date.toLocaleDateString('ru-RU', {
-      day: '2-digit',
-      month: '2-digit',
-      year: 'numeric',
-      hour: '2-digit',
-      minute: '2-digit'
-    });
-  } catch (e) {
-    return dateString;
-  }
+  const date = new Date(dateString);
+  if (Number.isNaN(date.getTime())) return dateString;
+  return dateTimeFormatter.format(date);
 }
 
 // Function to get user full name (moved to global scope)
@@ -826,7 +856,7 @@ export default function Branches() {
       }
       let query = supabase
         .from('branches')
-        .select('*')
+        .select("id, name, primary_client, city, responsible, responsible_id, strategy_plan, branch_birthday, visit_date, trading_hall, training, director, ns_rp, ns_op, ns_kp, ns_smo, mpp, top_clients_sds, top_clients_branch, upcoming_events, new_products, catalogs_samples, comments, task_info, created_at, updated_at")
         .order('created_at', { ascending: false });
       
       if (scope.isJKAM) {
@@ -835,12 +865,27 @@ export default function Branches() {
         query = query.eq('primary_client', pc);
       }
       
-      const { data, error } = await query;
-      
+      // Количество клиентов по филиалам: один запрос branch_id по всем
+      // клиентам в зоне доступа вместо отдельного count-запроса на филиал.
+      let clientsQuery = supabase.from('clients').select('branch_id');
+      if (scope.isJKAM) {
+        const conditions = [];
+        if (scope.userDbId) conditions.push(`responsible_id.eq.${scope.userDbId}`);
+        if (conditions.length) {
+          clientsQuery = clientsQuery.or(conditions.join(","));
+        } else {
+          clientsQuery = scope.pc ? clientsQuery.eq("primary_client", scope.pc) : clientsQuery;
+        }
+      } else if (!isGlobal && pc) {
+        clientsQuery = clientsQuery.eq('primary_client', pc);
+      }
+
+      const [{ data, error }, { data: clientRows }] = await Promise.all([query, clientsQuery]);
+
       if (error) {
         throw new Error('Ошибка при загрузке данных филиалов: ' + error.message);
       }
-      
+
       const list = data || [];
       if (!list.length) {
         alert('Нет данных для экспорта');
@@ -850,28 +895,15 @@ export default function Branches() {
         }
         return;
       }
-      
-      // Получаем количество клиентов по каждому филиалу
-      const branchesWithCounts = await Promise.all(list.map(async (branch) => {
-        let countQuery = supabase
-          .from('clients')
-          .select('id', { count: 'exact', head: true })
-          .eq('branch_id', branch.id);
-        if (scope.isJKAM) {
-          const conditions = [];
-          if (scope.userDbId) conditions.push(`responsible_id.eq.${scope.userDbId}`);
-          if (conditions.length) {
-            countQuery = countQuery.or(conditions.join(","));
-          } else {
-            countQuery = scope.pc ? countQuery.eq("primary_client", scope.pc) : countQuery;
-          }
-        }
-        const { count } = await countQuery;
-        
-        return {
-          ...branch,
-          clients_count: count || 0
-        };
+
+      const countsByBranch = new Map();
+      for (const row of clientRows || []) {
+        countsByBranch.set(row.branch_id, (countsByBranch.get(row.branch_id) || 0) + 1);
+      }
+
+      const branchesWithCounts = list.map((branch) => ({
+        ...branch,
+        clients_count: countsByBranch.get(branch.id) || 0,
       }));
       
       // Подготавливаем данные для Excel
@@ -913,34 +945,7 @@ export default function Branches() {
       const ws = XLSX.utils.json_to_sheet(excelData);
       
       // Настраиваем ширину колонок
-      ws['!cols'] = [
-        { wch: 36 },   // ID
-        { wch: 25 },   // Название
-        { wch: 20 },   // Клиент 1 порядка
-        { wch: 15 },   // Город
-        { wch: 20 },   // Ответственный
-        { wch: 40 },   // Стратегический план
-        { wch: 12 },   // ДР Филиала
-        { wch: 12 },   // Дата посещения
-        { wch: 15 },   // Торговый зал
-        { wch: 20 },   // Обучение
-        { wch: 20 },   // Директор
-        { wch: 10 },   // НС РП
-        { wch: 10 },   // НС ОП
-        { wch: 10 },   // НС КП
-        { wch: 10 },   // НС СМО
-        { wch: 10 },   // МПП
-        { wch: 20 },   // ТОП клиенты SDS
-        { wch: 20 },   // ТОП клиенты по филиалу
-        { wch: 20 },   // Мероприятия
-        { wch: 20 },   // Новинки
-        { wch: 20 },   // Каталоги/образцы
-        { wch: 30 },   // Комментарии
-        { wch: 20 },   // Информация к задаче
-        { wch: 10 },   // Количество клиентов
-        { wch: 18 },   // Дата создания
-        { wch: 18 },   // Дата обновления
-      ];
+      ws['!cols'] = BRANCHES_EXPORT_COL_WIDTHS;
       
       XLSX.utils.book_append_sheet(wb, ws, 'Филиалы');
       const dateStr = new Date().toISOString().split('T')[0];
@@ -990,15 +995,15 @@ export default function Branches() {
     }
     let query = supabase
       .from("branches")
-      .select("*")
+      .select("id, name, primary_client, city, responsible, responsible_id, strategy_plan, branch_birthday, visit_date, trading_hall, training, director, ns_rp, ns_op, ns_kp, ns_smo, mpp, top_clients_sds, top_clients_branch, upcoming_events, new_products, catalogs_samples, comments, task_info, created_at, updated_at")
       .order("created_at", { ascending: false });
-    
+
     if (scope.isJKAM) {
       query = applyResponsibleScope(query, scope);
     } else if (!isGlobal && pc) {
       query = query.eq('primary_client', pc);
     }
-    
+
     const { data, error } = await query;
     if (!error) {
       setBranches(data || []);
@@ -1378,17 +1383,33 @@ export default function Branches() {
     );
   });
 
+  // Количество клиентов по филиалам считается один раз на загруженный список:
+  // раньше filter по всем клиентам выполнялся на каждое сравнение сортировки.
+  const clientsCountByBranch = useMemo(() => {
+    const counts = new Map();
+    for (const client of clients) {
+      counts.set(client.branch_id, (counts.get(client.branch_id) || 0) + 1);
+    }
+    return counts;
+  }, [clients]);
+
   // Функция для подсчета клиентов в филиале
   function getClientsCount(branchId) {
-    return clients.filter(client => client.branch_id === branchId).length;
+    return clientsCountByBranch.get(branchId) || 0;
   }
 
+  // Ключи сортировки (имя, дата, количество клиентов) готовятся по разу
+  // на филиал, а не пересчитываются в компараторе.
+  const createdAtByBranch = new Map(
+    filteredBranches.map((b) => [b.id, b?.created_at ? new Date(b.created_at).getTime() : 0])
+  );
+
   const sortedBranches = [...filteredBranches].sort((a, b) => {
     const sortMode = filters.sort || "newest_first";
     const aName = String(a?.name || "").toLowerCase();
     const bName = String(b?.name || "").toLowerCase();
-    const aCreated = a?.created_at ? new Date(a.created_at).getTime() : 0;
-    const bCreated = b?.created_at ? new Date(b.created_at).getTime() : 0;
+    const aCreated = createdAtByBranch.get(a.id) || 0;
+    const bCreated = createdAtByBranch.get(b.id) || 0;
     const aClients = getClientsCount(a.id);
     const bClients = getClientsCount(b.id);
 
@@ -8,6 +8,28 @@ import * as XLSX from "xlsx";
 import { supabase } from "./supabaseClient";
 import { normalizeSearchText, normalizedIncludes } from "./searchUtils";
 
+// Ширины колонок Excel-выгрузки статичны — собираем массив один раз.
+const CLIENTS_EXPORT_COL_WIDTHS = [
+  { wch: 5 },   // ID
+  { wch: 30 },  // Название
+  { wch: 20 },  // Город
+  { wch: 15 },  // Клиент 1 порядка
+  { wch: 20 },  // Филиал
+  { wch: 40 },  // План развития
+  { wch: 50 },  // Работа по клиенту
+  { wch: 15 },  // Статус
+  { wch: 15 },  // Статус (код)
+  { wch: 20 },  // Ответственный (Telegram ID)
+  { wch: 25 },  // Ответственный
+  { wch: 15 },  // ИНН
+  { wch: 25 },  // Номера телефонов
+  { wch: 20 },  // Канал продаж
+  { wch: 40 },  // Информация
+  { wch: 15 },  // Дата посещения
+  { wch: 15 },  // Дата создания
+  { wch: 15 },  // Дата обновления
+];
+
 const CLIENT_DRAFT_KEY = "crm_clients_new_draft_v1";
 const CLIENTS_UI_STATE_KEY = "crm_clients_ui_state_v1";
 const CLIENT_EDIT_MODAL_DRAFT_PREFIX = "crm_clients_edit_modal_draft_v1:";
@@ -772,6 +794,23 @@ function shouldClearTaskDueDate(status) {
   return normalized === "пауза" || normalized === "завершено" || normalized === "завершена" || normalized === "завершен";
 }
 
+// Форматтер создается один раз: toLocaleDateString с объектом опций
+// строит новый Intl.DateTimeFormat на каждый вызов.
+const dateTimeFormatter = new Intl.DateTimeFormat("ru-RU", {
+  day: "2-digit",
+  month: "2-digit",
+  year: "numeric",
+  hour: "2-digit",
+  minute: "2-digit",
+});
+
+function formatDateTime(dateString) {
+  if (!dateString) return "не указан";
+  const date = new Date(dateString);
+  if (Number.isNaN(date.getTime())) return dateString;
+  return dateTimeFormatter.format(date);
+}
+
 function CreateTaskForClientModal({ client, users = [], branches = [], onClose, onCreated }) {
   const statusOptions = [
     { value: "Выполняется", label: "В работе" },
@@ -1373,23 +1412,8 @@ export default function Clients() {
         query = query.eq('primary_client', pc);
       }
       
-      const { data, error } = await query;
-      
-      if (error) {
-        throw new Error('Ошибка при загрузке данных: ' + error.message);
-      }
-      
-      const list = data || [];
-      if (!list.length) {
-        alert('Нет данных для экспорта');
-        if (exportBtn) {
-          exportBtn.textContent = originalText;
-          exportBtn.disabled = false;
-        }
-        return;
-      }
-      
-      // Загружаем пользователей для получения информации об ответственных
+      // Загружаем пользователей для получения информации об ответственных.
+      // Запрос не зависит от списка клиентов, поэтому выполняем оба параллельно.
       let usersQuery = supabase
         .from('users')
         .select('telegram_id, first_name, last_name, username, role')
@@ -1403,7 +1427,22 @@ export default function Clients() {
       } else if (!isGlobal && pc) {
         usersQuery = usersQuery.eq('primary_client', pc);
       }
-      const { data: usersData } = await usersQuery;
+
+      const [{ data, error }, { data: usersData }] = await Promise.all([query, usersQuery]);
+
+      if (error) {
+        throw new Error('Ошибка при загрузке данных: ' + error.message);
+      }
+
+      const list = data || [];
+      if (!list.length) {
+        alert('Нет данных для экспорта');
+        if (exportBtn) {
+          exportBtn.textContent = originalText;
+          exportBtn.disabled = false;
+        }
+        return;
+      }
       
       const usersMap = {};
       if (usersData) {
@@ -1447,26 +1486,7 @@ export default function Clients() {
       
       const wb = XLSX.utils.book_new();
       const ws = XLSX.utils.json_to_sheet(excelData);
-      ws['!cols'] = [
-        { wch: 5 },   // ID
-        { wch: 30 },  // Название
-        { wch: 20 },  // Город
-        { wch: 15 },  // Клиент 1 порядка
-        { wch: 20 },  // Филиал
-        { wch: 40 },  // План развития
-        { wch: 50 },  // Работа по клиенту
-        { wch: 15 },  // Статус
-        { wch: 15 },  // Статус (код)
-        { wch: 20 },  // Ответственный (Telegram ID)
-        { wch: 25 },  // Ответственный
-        { wch: 15 },  // ИНН
-        { wch: 25 },  // Номера телефонов
-        { wch: 20 },  // Канал продаж
-        { wch: 40 },  // Информация
-        { wch: 15 },  // Дата посещения
-        { wch: 15 },  // Дата создания
-        { wch: 15 },  // Дата обновления
-      ];
+      ws['!cols'] = CLIENTS_EXPORT_COL_WIDTHS;
       XLSX.utils.book_append_sheet(wb, ws, 'Клиенты');
       const dateStr = new Date().toISOString().split('T')[0];
       const fileName = `Клиенты_${dateStr}_${new Date().getHours()}${new Date().getMinutes()}.xlsx`;
@@ -1492,9 +1512,15 @@ export default function Clients() {
     fetchClients();
     fetchBranches();
     fetchUsers();
-    fetchPrimaryClients();
   }, []);
 
+  // Обновление уникальных клиентов 1 порядка при изменении списка клиентов:
+  // отдельный запрос к той же таблице с теми же ограничениями не нужен.
+  useEffect(() => {
+    const uniqueClients = [...new Set(clients.map((c) => c.primary_client).filter(Boolean))];
+    setPrimaryClients(uniqueClients);
+  }, [clients]);
+
   async function fetchClients() {
     const scope = getAccessScope();
     const { pc, isGlobal } = scope;
@@ -1580,32 +1606,6 @@ export default function Clients() {
     }
   }
 
-  async function fetchPrimaryClients() {
-    const scope = getAccessScope();
-    const { pc, isGlobal } = scope;
-    if (!isGlobal && !scope.isJKAM && !pc) {
-      setPrimaryClients([]);
-      return;
-    }
-    let query = supabase
-      .from("clients")
-      .select("primary_client")
-      .not("primary_client", "is", null);
-    
-    if (scope.isJKAM) {
-      query = applyResponsibleScope(query, scope);
-    } else if (!isGlobal && pc) {
-      query = query.eq('primary_client', pc);
-    }
-    
-    const { data, error } = await query;
-    
-    if (!error) {
-      const uniqueClients = [...new Set(data.map(item => item.primary_client))];
-      setPrimaryClients(uniqueClients);
-    }
-  }
-
   async function addClient() {
     if (isSavingNewClient) {
       return;
@@ -1676,7 +1676,6 @@ export default function Clients() {
         localStorage.removeItem(CLIENT_DRAFT_KEY);
         setIsAdding(false);
         fetchClients();
-        fetchPrimaryClients();
       } else {
         if (!error && !insertedClient?.id) {
           alert("Клиент не создан: нет доступа к записи или сессия устарела. Обновите страницу и попробуйте снова.");
@@ -1729,9 +1728,6 @@ export default function Clients() {
 
       if (!error && updatedClient?.id) {
         fetchClients();
-        if (field === "primary_client") {
-          fetchPrimaryClients();
-        }
         return true;
       }
       if (!error && !updatedClient?.id) {
@@ -1913,12 +1909,8 @@ export default function Clients() {
         (!filters.branch_id || String(client.branch_id || "") === String(filters.branch_id)) &&
         matchesResponsibleFilter(client)
       );
-    })
-    .sort((a, b) => {
-      const ta = a?.created_at ? new Date(a.created_at).getTime() : 0;
-      const tb = b?.created_at ? new Date(b.created_at).getTime() : 0;
-      return tb - ta;
     });
+  // Порядок (created_at по убыванию) уже задаёт fetchClients, filter его сохраняет.
 
   function renderAddForm() {
     return (
@@ -2450,22 +2442,6 @@ export default function Clients() {
     );
   }
 
-  const formatDateTime = (dateString) => {
-    if (!dateString) return "не указан";
-    try {
-      const date = new Date(dateString);
-      return date.toLocaleDateString('ru-RU', {
-        day: '2-digit',
-        month: '2-digit',
-        year: 'numeric',
-        hour: '2-digit',
-        minute: '2-digit'
-      });
-    } catch (e) {
-      return dateString;
-    }
-  };
-
   return (
     <Wrap>
       <div style={{ display: "flex", justifyContent: "space-between", width: "100%", maxWidth: 1200 }}>
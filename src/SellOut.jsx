@@ -1192,17 +1192,20 @@ export default function SellOut() {
 
       let persistedFactsCount = processedFacts;
       if (uploadRecordId && upsertsToApply.length > 0) {
+        // Достаточно проверки существования: точный count заставляет PostgREST
+        // пересчитывать все строки загрузки, а число записей уже известно.
         const verifyPersist = await supabase
           .from("sellout_facts")
-          .select("id", { head: true, count: "exact" })
-          .eq("upload_id", uploadRecordId);
+          .select("id")
+          .eq("upload_id", uploadRecordId)
+          .limit(1);
         if (verifyPersist.error) {
           throw new Error(`Данные записаны, но не удалось подтвердить сохранение: ${verifyPersist.error.message}`);
         }
-        persistedFactsCount = Number(verifyPersist.count || 0);
-        if (persistedFactsCount <= 0) {
+        if (!verifyPersist.data || verifyPersist.data.length === 0) {
           throw new Error("Импорт завершился без ошибок, но данные не найдены в таблице sellout_facts.");
         }
+        persistedFactsCount = upsertsToApply.length;
       }
 
       const rowsSuccess = rows.length;
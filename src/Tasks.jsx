@@ -11,22 +11,73 @@ import { normalizeSearchText, normalizedIncludes } from "./searchUtils";
 // Количество записей на странице
 const PAGE_SIZE = 20;
 
+// Справочники (пользователи, клиенты, филиалы) меняются редко, а загружаются
+// при каждом открытии страницы. Короткий TTL-кэш в памяти модуля убирает
+// повторные запросы к Supabase при навигации туда-обратно.
+const REFERENCE_CACHE_TTL_MS = 60000;
+const referenceCache = new Map();
+
+function getCachedReference(key) {
+  const entry = referenceCache.get(key);
+  return entry && Date.now() - entry.ts < REFERENCE_CACHE_TTL_MS ? entry.data : null;
+}
+
+function setCachedReference(key, data) {
+  referenceCache.set(key, { ts: Date.now(), data });
+}
+
+// Ключ кэша должен учитывать область доступа, иначе после смены аккаунта
+// можно показать чужой справочник.
+function referenceScopeKey(scope) {
+  return `${scope.isGlobal ? "*" : scope.pc || ""}:${scope.isJKAM ? `jkam:${scope.userDbId || ""}` : ""}`;
+}
+
+// Роли, которые могут назначать задачи себе
+const SELF_ASSIGNMENT_ROLES = ["admin", "RKP", "KAM", "JKAM", "regional_manager"];
+
+// Маппинг ролей постановщика на допустимые роли исполнителя
+const ROLE_ASSIGNMENT_MAP = {
+  admin: ['RKP', 'KAM', 'JKAM', 'regional_manager'],
+  RKP: ['KAM', 'JKAM', 'regional_manager'],
+  KAM: ['JKAM', 'regional_manager'],
+  JKAM: ['regional_manager'],
+  regional_manager: []
+};
+
+// Опции статусов задач
+const STATUS_OPTIONS = [
+  { value: "Выполняется", label: "В работе" },
+  { value: "Пауза", label: "Пауза" },
+  { value: "Просрочена", label: "Просрочена" },
+  { value: "Результат на согласовании", label: "Результат на согласовании" },
+  { value: "Завершено", label: "Завершено" }
+];
+
+function normalizeForWordStart(s) {
+  return normalizeSearchText(s, {
+    stripQuotes: true,
+    collapseWhitespace: false,
+  }).replace(/\s+/g, " ");
+}
+
+// Матчер собирается один раз на запрос: нормализация строки поиска не
+// повторяется для каждого варианта списка.
+function buildWordStartMatcher(query) {
+  const q = normalizeForWordStart(query).trim();
+  if (!q) return () => true;
+  return (value) => {
+    const normalizedValue = normalizeForWordStart(value);
+    const words = normalizedValue
+      .split(/[\s\[\]\(\)\-_,.;:/\\]+/)
+      .filter(Boolean);
+
+    // Приоритет: совпадение по началу слова, fallback: вхождение в любом месте.
+    return words.some((w) => w.startsWith(q)) || normalizedValue.includes(q);
+  };
+}
+
 function matchesWordStart(value, query) {
-  const normalize = (s) =>
-    normalizeSearchText(s, {
-      stripQuotes: true,
-      collapseWhitespace: false,
-    }).replace(/\s+/g, " ");
-
-  const q = normalize(query).trim();
-  if (!q) return true;
-  const normalizedValue = normalize(value);
-  const words = normalizedValue
-    .split(/[\s\[\]\(\)\-_,.;:/\\]+/)
-    .filter(Boolean);
-
-  // Приоритет: совпадение по началу слова, fallback: вхождение в любом месте.
-  return words.some((w) => w.startsWith(q)) || normalizedValue.includes(q);
+  return buildWordStartMatcher(query)(value);
 }
 
 function SmartAutocomplete({
@@ -59,8 +110,10 @@ function SmartAutocomplete({
 
   useEffect(() => undefined, []);
 
-  const filteredOptions = options.filter((opt) =>
-    matchesWordStart(opt.searchText || opt.label, inputValue)
+  const matchesInput = useMemo(() => buildWordStartMatcher(inputValue), [inputValue]);
+  const filteredOptions = useMemo(
+    () => options.filter((opt) => matchesInput(opt.searchText || opt.label)),
+    [options, matchesInput]
   );
 
   return (
@@ -174,40 +227,71 @@ function normalizeTaskStatus(status) {
   return raw;
 }
 
+// Полное имя пользователя для списков и выгрузок
+function getUserFullName(user) {
+  if (!user) return "";
+  if (user.first_name && user.last_name) {
+    return `${user.first_name} ${user.last_name}`;
+  } else if (user.first_name) {
+    return user.first_name;
+  } else if (user.username) {
+    return `@${user.username}`;
+  } else if (user.role) {
+    return user.role;
+  } else {
+    return user.telegram_id || "Неизвестный";
+  }
+}
+
 function shouldClearTaskDueDate(status) {
   const normalizedStatus = normalizeTaskStatus(status);
   return normalizedStatus === "Пауза" || normalizedStatus === "Завершено";
 }
 
+// Форматтеры создаются один раз: toLocaleDateString с объектом опций
+// строит новый Intl.DateTimeFormat на каждый вызов.
+const dateTimeFormatter = new Intl.DateTimeFormat("ru-RU", {
+  day: "2-digit",
+  month: "2-digit",
+  year: "numeric",
+  hour: "2-digit",
+  minute: "2-digit",
+});
+
+const dateOnlyFormatter = new Intl.DateTimeFormat("ru-RU", {
+  day: "2-digit",
+  month: "2-digit",
+  year: "numeric",
+});
+
+// Кэш готовых строк: одни и те же даты форматируются заново на каждый
+// рендер таблицы. Ограничение по размеру — чтобы выгрузка большого
+// списка не раздувала Map бесконечно.
+const FORMATTED_DATE_CACHE_LIMIT = 2000;
+const formattedDateTimeCache = new Map();
+const formattedDateOnlyCache = new Map();
+
+function formatWithCache(cache, formatter, dateString) {
+  const cached = cache.get(dateString);
+  if (cached !== undefined) return cached;
+  // new Date не бросает исключений — невалидный ввод дает Invalid Date,
+  // поэтому вместо try/catch достаточно проверки getTime().
+  const date = new Date(dateString);
+  const formatted = Number.isNaN(date.getTime()) ? dateString : formatter.format(date);
+  if (cache.size >= FORMATTED_DATE_CACHE_LIMIT) cache.clear();
+  cache.set(dateString, formatted);
+  return formatted;
+}
+
 // Вспомогательная функция для форматирования даты
 function formatDateTime(dateString) {
   if (!dateString) return "не указан";
-  try {
-    const date = new Date(dateString);
-    return date.toLocaleDateString('ru-RU', {
-      day: '2-digit',
-      month: '2-digit',
-      year: 'numeric',
-      hour: '2-digit',
-      minute: '2-digit'
-    });
-  } catch (e) {
-    return dateString;
-  }
+  return formatWithCache(formattedDateTimeCache, dateTimeFormatter, dateString);
 }
 
 function formatDateOnly(dateString) {
   if (!dateString) return "не указан";
-  try {
-    const date = new Date(dateString);
-    return date.toLocaleDateString("ru-RU", {
-      day: "2-digit",
-      month: "2-digit",
-      year: "numeric",
-    });
-  } catch (e) {
-    return dateString;
-  }
+  return formatWithCache(formattedDateOnlyCache, dateOnlyFormatter, dateString);
 }
 
 function extractDatePart(value) {
@@ -245,20 +329,84 @@ function normalizeDayStart(value) {
   return Number.isNaN(start.getTime()) ? null : start.toISOString();
 }
 
+// Границы диапазона считаются сразу в миллисекундах, без прогонки
+// через ISO-строку и повторного new Date().
+function dayStartTime(value) {
+  const datePart = extractDatePart(value);
+  if (!datePart) return null;
+  const time = new Date(`${datePart}T00:00:00`).getTime();
+  return Number.isNaN(time) ? null : time;
+}
+
+function dayEndTime(value) {
+  const datePart = extractDatePart(value);
+  if (datePart) {
+    const time = new Date(`${datePart}T23:59:00`).getTime();
+    if (!Number.isNaN(time)) return time;
+  }
+  const parsed = new Date(String(value || "").trim()).getTime();
+  return Number.isNaN(parsed) ? null : parsed;
+}
+
 function isDueDateWithinRange(dueDate, fromDate, toDate) {
   if (!dueDate) return false;
   const dueTime = new Date(dueDate).getTime();
   if (Number.isNaN(dueTime)) return false;
 
-  const from = normalizeDayStart(fromDate);
-  if (from && dueTime < new Date(from).getTime()) return false;
+  if (fromDate) {
+    const from = dayStartTime(fromDate);
+    if (from !== null && dueTime < from) return false;
+  }
 
-  const to = normalizeDueDate(toDate);
-  if (to && dueTime > new Date(to).getTime()) return false;
+  if (toDate) {
+    const to = dayEndTime(toDate);
+    if (to !== null && dueTime > to) return false;
+  }
 
   return true;
 }
 
+// Ширины колонок Excel-выгрузки статичны — собираем массивы один раз.
+const TASKS_EXPORT_COL_WIDTHS = [
+  { wch: 5 },   // ID
+  { wch: 30 },  // Название
+  { wch: 20 },  // Клиент (ID)
+  { wch: 25 },  // Клиент (имя)
+  { wch: 15 },  // Город клиента
+  { wch: 15 },  // Статус клиента
+  { wch: 15 },  // Клиент 1 порядка
+  { wch: 20 },  // Филиал (ID)
+  { wch: 20 },  // Филиал (имя)
+  { wch: 15 },  // Город задачи
+  { wch: 20 },  // Дедлайн
+  { wch: 15 },  // Статус
+  { wch: 20 },  // Постановщик
+  { wch: 15 },  // Роль постановщика
+  { wch: 15 },  // Клиент 1 порядка (пост.)
+  { wch: 20 },  // Исполнитель
+  { wch: 15 },  // Роль исполнителя
+  { wch: 40 },  // Описание
+  { wch: 40 },  // Результат
+  { wch: 40 },  // Комментарии
+  { wch: 20 },  // Дата создания
+  { wch: 20 },  // Дата обновления
+];
+
+const TASKS_EXPORT_STATS_COL_WIDTHS = [{ wch: 25 }, { wch: 20 }];
+
+// Задержка перед запросом при вводе в текстовые фильтры: без нее каждое
+// нажатие клавиши отправляло отдельный запрос к базе.
+const FILTER_DEBOUNCE_MS = 250;
+
+function useDebouncedValue(value, delayMs) {
+  const [debounced, setDebounced] = useState(value);
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delayMs);
+    return () => clearTimeout(timer);
+  }, [value, delayMs]);
+  return debounced;
+}
+
 // Компонент модального окна для редактирования полей
 function EditModal({ 
   field, 
@@ -285,34 +433,6 @@ function EditModal({
   const [isSaving, setIsSaving] = useState(false);
   const [availableClients, setAvailableClients] = useState([]);
   const [availableAssignees, setAvailableAssignees] = useState([]);
-  
-  // Роли, которые могут назначать задачи себе
-  const SELF_ASSIGNMENT_ROLES = ["admin", "RKP", "KAM", "JKAM", "regional_manager"];
-  
-  // Маппинг ролей постановщика на допустимые роли исполнителя
-  const ROLE_ASSIGNMENT_MAP = {
-    admin: ['RKP', 'KAM', 'JKAM', 'regional_manager'],
-    RKP: ['KAM', 'JKAM', 'regional_manager'],
-    KAM: ['JKAM', 'regional_manager'],
-    JKAM: ['regional_manager'],
-    regional_manager: []
-  };
-
-  // Получение полного имени пользователя
-  const getUserFullName = (user) => {
-    if (!user) return "";
-    if (user.first_name && user.last_name) {
-      return `${user.first_name} ${user.last_name}`;
-    } else if (user.first_name) {
-      return user.first_name;
-    } else if (user.username) {
-      return `@${user.username}`;
-    } else if (user.role) {
-      return user.role;
-    } else {
-      return user.telegram_id || "Неизвестный";
-    }
-  };
 
   // Получение клиента по id
   const getClientById = (clientId) => {
@@ -960,20 +1080,6 @@ function CreateTaskModal({
   const [branchSearch, setBranchSearch] = useState("");
   const [assigneeSearch, setAssigneeSearch] = useState("");
 
-  // Роли, которые могут назначать задачи себе
-  const SELF_ASSIGNMENT_ROLES = ["admin", "RKP", "KAM", "JKAM", "regional_manager"];
-  
-  // Маппинг ролей постановщика на допустимые роли исполнителя
-  const ROLE_ASSIGNMENT_MAP = {
-    admin: ['RKP', 'KAM', 'JKAM', 'regional_manager'],
-    RKP: ['KAM', 'JKAM', 'regional_manager'],
-    KAM: ['JKAM', 'regional_manager'],
-    JKAM: ['regional_manager'],
-    regional_manager: [],
-    undefined: [],
-    null: [],
-  };
-
   // Обработчик горячих клавиш
   useEffect(() => {
     const handleKeyDown = (e) => {
@@ -988,22 +1094,6 @@ function CreateTaskModal({
     return () => document.removeEventListener("keydown", handleKeyDown);
   }, [newTask]);
 
-  // Получение полного имени пользователя
-  const getUserFullName = (user) => {
-    if (!user) return "";
-    if (user.first_name && user.last_name) {
-      return `${user.first_name} ${user.last_name}`;
-    } else if (user.first_name) {
-      return user.first_name;
-    } else if (user.username) {
-      return `@${user.username}`;
-    } else if (user.role) {
-      return user.role;
-    } else {
-      return user.telegram_id || "Неизвестный";
-    }
-  };
-
   // Получение клиента по id
   const getClientById = (clientId) => {
     if (!clientId) return null;
@@ -1075,14 +1165,14 @@ function CreateTaskModal({
     setAssignerClients(assignerClientsList);
     setAvailableAssignees([]);
     
-    setNewTask({
-      ...newTask,
+    setNewTask((prev) => ({
+      ...prev,
       assigner_telegram_id: assignerId,
       primary_client: assignerPrimaryClient,
       client_id: "",
       branch_id: "",
       assignee_telegram_id: ""
-    });
+    }));
     setSelectedClient(null);
   };
 
@@ -1094,17 +1184,17 @@ function CreateTaskModal({
     setSelectedClient(client);
     setAvailableAssignees(assignees);
     
-    setNewTask({
-      ...newTask,
+    setNewTask((prev) => ({
+      ...prev,
       client_id: clientId,
       branch_id: client?.branch_id || "",
       assignee_telegram_id: ""
-    });
+    }));
   };
 
   // Обработчик изменения даты дедлайна
   const handleDueDateChange = (dateValue) => {
-    setNewTask({ ...newTask, due_date: dateValue || "" });
+    setNewTask((prev) => ({ ...prev, due_date: dateValue || "" }));
   };
 
   // Функция создания задачи
@@ -1152,27 +1242,32 @@ function CreateTaskModal({
     return extractDatePart(dateString);
   };
 
-  const filteredAssigners = users.filter((user) =>
-    matchesWordStart(
-      `${getUserFullName(user)} ${user.role || ""} ${user.primary_client || ""}`,
-      assignerSearch
-    )
-  );
-  const filteredClients = assignerClients.filter((client) =>
-    matchesWordStart(
-      `${client.name || ""} ${client.city || ""} ${client.status_text || ""}`,
-      clientSearch
-    )
-  );
-  const filteredBranches = branches.filter((branch) =>
-    matchesWordStart(`${branch.name || ""} ${branch.primary_client || ""}`, branchSearch)
-  );
-  const filteredAssignees = availableAssignees.filter((user) =>
-    matchesWordStart(
-      `${getUserFullName(user)} ${user.role || ""} ${user.primary_client || ""}`,
-      assigneeSearch
-    )
-  );
+  // Списки пересобираются только при изменении источника или строки поиска,
+  // а не на каждый ввод в любое поле формы.
+  const filteredAssigners = useMemo(() => {
+    const matches = buildWordStartMatcher(assignerSearch);
+    return users.filter((user) =>
+      matches(`${getUserFullName(user)} ${user.role || ""} ${user.primary_client || ""}`)
+    );
+  }, [users, assignerSearch]);
+  const filteredClients = useMemo(() => {
+    const matches = buildWordStartMatcher(clientSearch);
+    return assignerClients.filter((client) =>
+      matches(`${client.name || ""} ${client.city || ""} ${client.status_text || ""}`)
+    );
+  }, [assignerClients, clientSearch]);
+  const filteredBranches = useMemo(() => {
+    const matches = buildWordStartMatcher(branchSearch);
+    return branches.filter((branch) =>
+      matches(`${branch.name || ""} ${branch.primary_client || ""}`)
+    );
+  }, [branches, branchSearch]);
+  const filteredAssignees = useMemo(() => {
+    const matches = buildWordStartMatcher(assigneeSearch);
+    return availableAssignees.filter((user) =>
+      matches(`${getUserFullName(user)} ${user.role || ""} ${user.primary_client || ""}`)
+    );
+  }, [availableAssignees, assigneeSearch]);
   const selectedClientDevelopmentPlan = selectedClient?.development_plan || "";
 
   return (
@@ -1217,7 +1312,7 @@ function CreateTaskModal({
                 type="text"
                 placeholder="Введите название задачи"
                 value={newTask.title}
-                onChange={(e) => setNewTask({ ...newTask, title: e.target.value })}
+                onChange={(e) => setNewTask((prev) => ({ ...prev, title: e.target.value }))}
                 style={{ 
                   width: "100%",
                   padding: "10px 12px",
@@ -1434,7 +1529,7 @@ function CreateTaskModal({
               </div>
               <SmartAutocomplete
                 value={newTask.branch_id}
-                onSelect={(v) => setNewTask({ ...newTask, branch_id: v })}
+                onSelect={(v) => setNewTask((prev) => ({ ...prev, branch_id: v }))}
                 options={branches.map((branch) => ({
                   value: branch.id,
                   label: `${branch.name}${branch.primary_client ? ` [${branch.primary_client}]` : ""}`,
@@ -1462,7 +1557,7 @@ function CreateTaskModal({
               />
               <select
                 value={newTask.branch_id}
-                onChange={(e) => setNewTask({ ...newTask, branch_id: e.target.value })}
+                onChange={(e) => setNewTask((prev) => ({ ...prev, branch_id: e.target.value }))}
                 style={{ 
                   width: "100%",
                   padding: "10px 12px",
@@ -1491,7 +1586,7 @@ function CreateTaskModal({
               </div>
               <SmartAutocomplete
                 value={newTask.assignee_telegram_id}
-                onSelect={(v) => setNewTask({ ...newTask, assignee_telegram_id: String(v || "") })}
+                onSelect={(v) => setNewTask((prev) => ({ ...prev, assignee_telegram_id: String(v || "") }))}
                 disabled={!newTask.assigner_telegram_id || !newTask.client_id}
                 options={availableAssignees.map((user) => ({
                   value: String(user.telegram_id),
@@ -1521,7 +1616,7 @@ function CreateTaskModal({
               />
               <select
                 value={newTask.assignee_telegram_id}
-                onChange={(e) => setNewTask({ ...newTask, assignee_telegram_id: e.target.value })}
+                onChange={(e) => setNewTask((prev) => ({ ...prev, assignee_telegram_id: e.target.value }))}
                 disabled={!newTask.assigner_telegram_id || !newTask.client_id}
                 style={{ 
                   width: "100%",
@@ -1597,7 +1692,7 @@ function CreateTaskModal({
           </div>
           <textarea
             value={newTask.description}
-            onChange={(e) => setNewTask({ ...newTask, description: e.target.value })}
+            onChange={(e) => setNewTask((prev) => ({ ...prev, description: e.target.value }))}
             style={{ 
               width: "100%",
               minHeight: 100,
@@ -1697,22 +1792,6 @@ function EditableField({
     return value || "";
   };
 
-  // Получение полного имени пользователя
-  const getUserFullName = (user) => {
-    if (!user) return "";
-    if (user.first_name && user.last_name) {
-      return `${user.first_name} ${user.last_name}`;
-    } else if (user.first_name) {
-      return user.first_name;
-    } else if (user.username) {
-      return `@${user.username}`;
-    } else if (user.role) {
-      return user.role;
-    } else {
-      return user.telegram_id || "Неизвестный";
-    }
-  };
-
   return (
     <div
       style={{
@@ -1778,6 +1857,10 @@ export default function Tasks() {
   const [qBranch, setQBranch] = useState(""); // Фильтр по филиалу
   const [dateFrom, setDateFrom] = useState("");
   const [dateTo, setDateTo] = useState("");
+  // Текстовые фильтры уходят в запрос с задержкой; селекты и даты — сразу.
+  const debouncedSearchQuery = useDebouncedValue(searchQuery, FILTER_DEBOUNCE_MS);
+  const debouncedQTitle = useDebouncedValue(qTitle, FILTER_DEBOUNCE_MS);
+  const debouncedQClient = useDebouncedValue(qClient, FILTER_DEBOUNCE_MS);
   // Сортировка
   const [sortBy, setSortBy] = useState("due_date");
   const [sortOrder, setSortOrder] = useState("asc");
@@ -1854,20 +1937,6 @@ export default function Tasks() {
     taskData: null
   });
 
-  // Роли, которые могут назначать задачи себе
-  const SELF_ASSIGNMENT_ROLES = ["admin", "RKP", "KAM", "JKAM", "regional_manager"];
-  
-  // Маппинг ролей постановщика на допустимые роли исполнителя
-  const ROLE_ASSIGNMENT_MAP = {
-    admin: ['RKP', 'KAM', 'JKAM', 'regional_manager'],
-    RKP: ['KAM', 'JKAM', 'regional_manager'],
-    KAM: ['JKAM', 'regional_manager'],
-    JKAM: ['regional_manager'],
-    regional_manager: [],
-    undefined: [],
-    null: [],
-  };
-
   const EDGE_NOTIFICATIONS_ENABLED = false;
 
   useEffect(() => undefined, []);
@@ -1913,10 +1982,13 @@ export default function Tasks() {
     const authorUserId = String(localStorage.getItem("currentUserId") || "").trim();
     const assignerUser = getUserByTelegramId(task.assigner_telegram_id);
     const assigneeUser = getUserByTelegramId(task.assignee_telegram_id);
-    const recipients = [assignerUser, assigneeUser]
-      .filter(Boolean)
-      .filter((user, index, arr) => arr.findIndex((u) => String(u.id) === String(user.id)) === index)
-      .filter((user) => String(user.id || "") !== authorUserId);
+    const recipientsById = new Map(
+      [assignerUser, assigneeUser]
+        .filter(Boolean)
+        .map((user) => [String(user.id), user])
+    );
+    recipientsById.delete(authorUserId);
+    const recipients = [...recipientsById.values()];
 
     if (!recipients.length) return;
 
@@ -1969,7 +2041,14 @@ export default function Tasks() {
   // Загрузка пользователей из таблицы users
   async function loadUsers() {
     try {
-      const { pc, isGlobal } = getAccessScope();
+      const scope = getAccessScope();
+      const { pc, isGlobal } = scope;
+      const cacheKey = `users:${referenceScopeKey(scope)}`;
+      const cached = getCachedReference(cacheKey);
+      if (cached) {
+        setUsers(cached);
+        return;
+      }
       let query = supabase
         .from("users")
         .select("id, telegram_id, username, first_name, last_name, role, primary_client, branch_id, city")
@@ -1985,7 +2064,8 @@ export default function Tasks() {
         console.error("Ошибка при загрузке пользователей:", error);
         return;
       }
-      
+
+      setCachedReference(cacheKey, data || []);
       setUsers(data || []);
     } catch (err) {
       console.error("Ошибка при загрузке пользователей:", err);
@@ -1997,7 +2077,13 @@ export default function Tasks() {
     try {
       const scope = getAccessScope();
       const { pc, isGlobal } = scope;
-      
+      const cacheKey = `clients:${referenceScopeKey(scope)}`;
+      const cached = getCachedReference(cacheKey);
+      if (cached) {
+        setClients(cached);
+        return;
+      }
+
       let query = supabase
         .from("clients")
         .select("id, name, primary_client, city, status, status_text, branch_id, responsible_id, development_plan, info, clients_responsible_manager")
@@ -2015,7 +2101,8 @@ export default function Tasks() {
         console.error("Ошибка при загрузке клиентов:", error);
         return;
       }
-      
+
+      setCachedReference(cacheKey, data || []);
       setClients(data || []);
     } catch (err) {
       console.error("Ошибка при загрузке клиентов:", err);
@@ -2027,6 +2114,12 @@ export default function Tasks() {
     try {
       const scope = getAccessScope();
       const { pc, isGlobal } = scope;
+      const cacheKey = `branches:${referenceScopeKey(scope)}`;
+      const cached = getCachedReference(cacheKey);
+      if (cached) {
+        setBranches(cached);
+        return;
+      }
       let query = supabase
         .from("branches")
         .select("id, name, primary_client")
@@ -2044,7 +2137,8 @@ export default function Tasks() {
         console.error("Ошибка при загрузке филиалов:", error);
         return;
       }
-      
+
+      setCachedReference(cacheKey, data || []);
       setBranches(data || []);
     } catch (err) {
       console.error("Ошибка при загрузке филиалов:", err);
@@ -2055,7 +2149,7 @@ export default function Tasks() {
   useEffect(() => {
     fetchTasks();
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [page, searchQuery, qTitle, qClient, qPrimaryClient, qAssignee, qBranch, dateFrom, dateTo, sortBy, sortOrder]);
+  }, [page, debouncedSearchQuery, debouncedQTitle, debouncedQClient, qPrimaryClient, qAssignee, qBranch, dateFrom, dateTo, sortBy, sortOrder]);
 
   useEffect(() => {
     if (!expandedTaskId) return;
@@ -2075,26 +2169,6 @@ export default function Tasks() {
       return;
     }
 
-    const includes = (v, q) => normalizedIncludes(v, q);
-    const matchesTaskFilters = (task) => {
-      if (searchQuery) {
-        const hit =
-          includes(task.title, searchQuery) ||
-          includes(task.client, searchQuery) ||
-          includes(task.primary_client, searchQuery) ||
-          includes(task.status, searchQuery) ||
-          includes(task.description, searchQuery);
-        if (!hit) return false;
-      }
-      if (qTitle && !includes(task.title, qTitle)) return false;
-      if (qClient && !includes(task.client, qClient)) return false;
-      if (qPrimaryClient && !includes(task.primary_client, qPrimaryClient)) return false;
-      if (qAssignee && String(task.assignee_telegram_id || "") !== String(qAssignee)) return false;
-      if (qBranch && String(task.branch_id || "") !== String(qBranch)) return false;
-      if ((dateFrom || dateTo) && !isDueDateWithinRange(task.due_date, dateFrom, dateTo)) return false;
-      return true;
-    };
-
     if (scope.isJKAM) {
       let ownQuery = supabase
         .from("tasks")
@@ -2121,42 +2195,32 @@ export default function Tasks() {
       return;
     }
     
-    // Считаем количество
-    let head = supabase
-      .from("tasks")
-      .select("*", { count: "exact", head: true });
-    if (!isGlobal && pc) {
-      head = head.eq('primary_client', pc);
-    }
-    head = applyFilters(head);
-    const headRes = await head;
-    if (!headRes.error) {
-      setTotal(headRes.count || 0);
-    }
-    
-    // Получаем записи с дополнительными данными о клиенте и филиале
+    // Получаем записи с дополнительными данными о клиенте и филиале.
+    // count: "exact" считается на стороне PostgREST в том же запросе,
+    // поэтому отдельный запрос за количеством не нужен.
     let query = supabase
       .from("tasks")
       .select(`
-        id, title, client, primary_client, due_date, status, 
-        assigner_telegram_id, assignee_telegram_id, description, 
+        id, title, client, primary_client, due_date, status,
+        assigner_telegram_id, assignee_telegram_id, description,
         result, comments, created_at, updated_at,
         client_id, branch_id, city,
         clients!tasks_client_id_fkey(name, city, status, status_text, manager_contact, responsible_id, development_plan, info, clients_responsible_manager),
         branches!tasks_branch_id_fkey(name)
-      `)
+      `, { count: "exact" })
       .order(sortBy, { ascending: sortOrder === "asc" })
       .range(range.from, range.to);
-    
+
     if (!isGlobal && pc) {
       query = query.eq('primary_client', pc);
     }
-    
+
     query = applyFilters(query);
-    const { data, error } = await query;
-    
+    const { data, error, count } = await query;
+
     if (!error) {
       setRows(data || []);
+      setTotal(count || 0);
     } else {
       console.error("Ошибка при загрузке задач:", error);
     }
@@ -2197,6 +2261,28 @@ export default function Tasks() {
     }
   }
 
+  // Клиентская проверка фильтров для путей, где поиск выполняется по
+  // нормализованному тексту (JKAM-список и выгрузка в Excel).
+  function matchesTaskFilters(task) {
+    const includes = (v, q) => normalizedIncludes(v, q);
+    if (searchQuery) {
+      const hit =
+        includes(task.title, searchQuery) ||
+        includes(task.client, searchQuery) ||
+        includes(task.primary_client, searchQuery) ||
+        includes(task.status, searchQuery) ||
+        includes(task.description, searchQuery);
+      if (!hit) return false;
+    }
+    if (qTitle && !includes(task.title, qTitle)) return false;
+    if (qClient && !includes(task.client, qClient)) return false;
+    if (qPrimaryClient && !includes(task.primary_client, qPrimaryClient)) return false;
+    if (qAssignee && String(task.assignee_telegram_id || "") !== String(qAssignee)) return false;
+    if (qBranch && String(task.branch_id || "") !== String(qBranch)) return false;
+    if ((dateFrom || dateTo) && !isDueDateWithinRange(task.due_date, dateFrom, dateTo)) return false;
+    return true;
+  }
+
   // Применяет фильтры поиска к запросу
   function applyFilters(qb) {
     if (searchQuery) {
@@ -2218,44 +2304,38 @@ export default function Tasks() {
     return qb;
   }
 
-  // Функция для получения полного имени пользователя
-  function getUserFullName(user) {
-    if (!user) return "";
-    if (user.first_name && user.last_name) {
-      return `${user.first_name} ${user.last_name}`;
-    } else if (user.first_name) {
-      return user.first_name;
-    } else if (user.username) {
-      return `@${user.username}`;
-    } else if (user.role) {
-      return user.role;
-    } else {
-      return user.telegram_id || "Неизвестный";
-    }
-  }
+  // Индексы справочников: линейный поиск выполнялся на каждую строку таблицы
+  // при каждом рендере, Map пересобирается только при обновлении списков.
+  const usersByTelegramId = useMemo(
+    () => new Map(users.map((u) => [String(u.telegram_id), u])),
+    [users]
+  );
+  const usersById = useMemo(() => new Map(users.map((u) => [u.id, u])), [users]);
+  const clientsById = useMemo(() => new Map(clients.map((c) => [c.id, c])), [clients]);
+  const branchesById = useMemo(() => new Map(branches.map((b) => [b.id, b])), [branches]);
 
   // Функция для получения пользователя по telegram_id
   function getUserByTelegramId(telegramId) {
     if (!telegramId) return null;
-    return users.find(u => String(u.telegram_id) === String(telegramId));
+    return usersByTelegramId.get(String(telegramId)) || null;
   }
 
   // Функция для получения пользователя по id (UUID)
   function getUserById(userId) {
     if (!userId) return null;
-    return users.find(u => u.id === userId);
+    return usersById.get(userId) || null;
   }
 
   // Функция для получения клиента по id
   function getClientById(clientId) {
     if (!clientId) return null;
-    return clients.find(c => c.id === clientId);
+    return clientsById.get(clientId) || null;
   }
 
   // Функция для получения филиала по id
   function getBranchById(branchId) {
     if (!branchId) return null;
-    return branches.find(b => b.id === branchId);
+    return branchesById.get(branchId) || null;
   }
 
   // Функция для получения списка доступных исполнителей для постановщика
@@ -2352,7 +2432,7 @@ export default function Tasks() {
           assigner_telegram_id, assignee_telegram_id, description, 
           result, comments, created_at, updated_at,
           client_id, branch_id, city,
-          clients!tasks_client_id_fkey(name, city, status, status_text, responsible_id, development_plan, info, clients_responsible_manager),
+          clients!tasks_client_id_fkey(name, city, status, status_text),
           branches!tasks_branch_id_fkey(name)
         `)
         .order(sortBy, { ascending: sortOrder === "asc" });
@@ -2378,25 +2458,7 @@ export default function Tasks() {
 
       let exportTasks = allTasks || [];
       if (scope.isJKAM) {
-        const includes = (v, q) => normalizedIncludes(v, q);
-        exportTasks = exportTasks.filter((task) => {
-          if (searchQuery) {
-            const hit =
-              includes(task.title, searchQuery) ||
-              includes(task.client, searchQuery) ||
-              includes(task.primary_client, searchQuery) ||
-              includes(task.status, searchQuery) ||
-              includes(task.description, searchQuery);
-            if (!hit) return false;
-          }
-          if (qTitle && !includes(task.title, qTitle)) return false;
-          if (qClient && !includes(task.client, qClient)) return false;
-          if (qPrimaryClient && !includes(task.primary_client, qPrimaryClient)) return false;
-          if (qAssignee && String(task.assignee_telegram_id || "") !== String(qAssignee)) return false;
-          if (qBranch && String(task.branch_id || "") !== String(qBranch)) return false;
-          if ((dateFrom || dateTo) && !isDueDateWithinRange(task.due_date, dateFrom, dateTo)) return false;
-          return true;
-        });
+        exportTasks = exportTasks.filter(matchesTaskFilters);
       }
 
       if (!exportTasks.length) {
@@ -2406,8 +2468,8 @@ export default function Tasks() {
 
       // Подготавливаем данные для Excel
       const excelData = exportTasks.map(task => {
-        const assigner = getUserByTelegramId(task.assigner_telegram_id);
-        const assignee = getUserByTelegramId(task.assignee_telegram_id);
+        const assigner = usersByTelegramId.get(String(task.assigner_telegram_id));
+        const assignee = usersByTelegramId.get(String(task.assignee_telegram_id));
         const client = task.clients || {};
         const branch = task.branches || {};
         const status = normalizeTaskStatus(task.status);
@@ -2444,45 +2506,26 @@ export default function Tasks() {
       // Создаем лист с данными
       const ws = XLSX.utils.json_to_sheet(excelData);
       
-      // Настраиваем ширину колонок
-      const colWidths = [
-        { wch: 5 },   // ID
-        { wch: 30 },  // Название
-        { wch: 20 },  // Клиент (ID)
-        { wch: 25 },  // Клиент (имя)
-        { wch: 15 },  // Город клиента
-        { wch: 15 },  // Статус клиента
-        { wch: 15 },  // Клиент 1 порядка
-        { wch: 20 },  // Филиал (ID)
-        { wch: 20 },  // Филиал (имя)
-        { wch: 15 },  // Город задачи
-        { wch: 20 },  // Дедлайн
-        { wch: 15 },  // Статус
-        { wch: 20 },  // Постановщик
-        { wch: 15 },  // Роль постановщика
-        { wch: 15 },  // Клиент 1 порядка (пост.)
-        { wch: 20 },  // Исполнитель
-        { wch: 15 },  // Роль исполнителя
-        { wch: 40 },  // Описание
-        { wch: 40 },  // Результат
-        { wch: 40 },  // Комментарии
-        { wch: 20 },  // Дата создания
-        { wch: 20 },  // Дата обновления
-      ];
-      ws['!cols'] = colWidths;
+      ws['!cols'] = TASKS_EXPORT_COL_WIDTHS;
 
       // Добавляем лист в книгу
       XLSX.utils.book_append_sheet(wb, ws, "Задачи");
 
-      // Создаем второй лист со статистикой
+      // Создаем второй лист со статистикой.
+      // Счётчики по статусам собираются за один проход вместо пяти filter().
+      const statusCounts = new Map();
+      for (const t of exportTasks) {
+        const status = normalizeTaskStatus(t.status);
+        statusCounts.set(status, (statusCounts.get(status) || 0) + 1);
+      }
       const statsData = [
         ["Статистика задач", ""],
         ["Общее количество задач", exportTasks.length],
-        ["В работе", exportTasks.filter(t => normalizeTaskStatus(t.status) === "В работе").length],
-        ["Пауза", exportTasks.filter(t => normalizeTaskStatus(t.status) === "Пауза").length],
-        ["Просрочено", exportTasks.filter(t => normalizeTaskStatus(t.status) === "Просрочена").length],
-        ["На согласовании", exportTasks.filter(t => normalizeTaskStatus(t.status) === "Результат на согласовании").length],
-        ["Завершено", exportTasks.filter(t => normalizeTaskStatus(t.status) === "Завершено").length],
+        ["В работе", statusCounts.get("В работе") || 0],
+        ["Пауза", statusCounts.get("Пауза") || 0],
+        ["Просрочено", statusCounts.get("Просрочена") || 0],
+        ["На согласовании", statusCounts.get("Результат на согласовании") || 0],
+        ["Завершено", statusCounts.get("Завершено") || 0],
         ["", ""],
         ["Дата выгрузки", formatDateTime(new Date().toISOString())],
         ["Примененные фильтры", ""],
@@ -2496,7 +2539,7 @@ export default function Tasks() {
       ];
 
       const ws2 = XLSX.utils.aoa_to_sheet(statsData);
-      ws2['!cols'] = [{ wch: 25 }, { wch: 20 }];
+      ws2['!cols'] = TASKS_EXPORT_STATS_COL_WIDTHS;
       XLSX.utils.book_append_sheet(wb, ws2, "Статистика");
 
       // Генерируем имя файла с датой
@@ -2529,7 +2572,8 @@ export default function Tasks() {
       // Получаем данные клиента для задачи
       const selectedClient = getClientById(taskData.client_id);
       const assigner = users.find(u => String(u.telegram_id) === String(taskData.assigner_telegram_id));
-      
+      const nowIso = new Date().toISOString();
+
       // Подготовка данных
       const insertData = {
         title: taskData.title,
@@ -2544,8 +2588,8 @@ export default function Tasks() {
         assigner_telegram_id: Number(taskData.assigner_telegram_id),
         assignee_telegram_id: Number(taskData.assignee_telegram_id),
         comments: null,
-        created_at: new Date().toISOString(),
-        updated_at: new Date().toISOString(),
+        created_at: nowIso,
+        updated_at: nowIso,
       };
       
       const { data: createdTask, error } = await runWithSupabaseTimeout(
@@ -2566,22 +2610,22 @@ export default function Tasks() {
         return false;
       }
       
-      // Отправляем уведомление исполнителю о новой задаче
+      // Отправляем уведомление исполнителю о новой задаче.
+      // Задача уже сохранена, поэтому не ждем уведомление — пусть уходит в фоне,
+      // а пользователь сразу видит обновленный список.
       if (taskData.assignee_telegram_id) {
         const assigner = users.find((u) => String(u.telegram_id) === String(taskData.assigner_telegram_id));
         const assignee = users.find((u) => String(u.telegram_id) === String(taskData.assignee_telegram_id));
-        
+
         const assignerName = assigner ? getUserFullName(assigner) : "Неизвестный";
-        try {
-          await notifyAssignee({
-            assigneeUserId: assignee?.id || null,
-            title: taskData.title,
-            assignerName,
-            taskId: createdTask?.id || null,
-          });
-        } catch (notifyError) {
+        notifyAssignee({
+          assigneeUserId: assignee?.id || null,
+          title: taskData.title,
+          assignerName,
+          taskId: createdTask?.id || null,
+        }).catch((notifyError) => {
           console.error("Уведомление не отправлено, но задача создана:", notifyError);
-        }
+        });
       }
       
       // Обновляем список задач
@@ -2605,8 +2649,11 @@ export default function Tasks() {
     if (field === 'assignee_telegram_id') {
       const assignerId = originalTask.assigner_telegram_id;
       const assigneeId = value;
-      
-      if (assigneeId !== assignerId) {
+
+      // value приходит строкой, assigner_telegram_id из БД — числом:
+      // строгое сравнение никогда не срабатывало, и назначение «на себя»
+      // каждый раз шло через полную проверку ролей.
+      if (String(assigneeId) !== String(assignerId)) {
         const assigner = users.find(u => String(u.telegram_id) === String(assignerId));
         const assignee = users.find(u => String(u.telegram_id) === String(assigneeId));
         
@@ -2632,6 +2679,7 @@ export default function Tasks() {
     }
 
     let updatePayload = null;
+    const nowIso = new Date().toISOString();
 
     // Если обновляется постановщик, получаем его primary_client
     if (field === 'assigner_telegram_id') {
@@ -2640,7 +2688,7 @@ export default function Tasks() {
       updatePayload = {
         [field]: value ? Number(value) : null,
         primary_client: assignerPrimaryClient || null,
-        updated_at: new Date().toISOString(),
+        updated_at: nowIso,
       };
     } else if (field === 'client_id') {
       const client = getClientById(value);
@@ -2650,19 +2698,19 @@ export default function Tasks() {
         client: client?.name || null,
         branch_id: client?.branch_id || assigner?.branch_id || null,
         city: client?.city || assigner?.city || null,
-        updated_at: new Date().toISOString(),
+        updated_at: nowIso,
       };
     } else if (field === 'due_date') {
       updatePayload = {
         [field]: normalizeDueDate(value),
-        updated_at: new Date().toISOString(),
+        updated_at: nowIso,
       };
     } else if (field === "status") {
       const normalizedStatus = normalizeTaskStatus(value);
       updatePayload = {
         status: normalizedStatus || null,
         due_date: shouldClearTaskDueDate(normalizedStatus) ? null : originalTask.due_date,
-        updated_at: new Date().toISOString(),
+        updated_at: nowIso,
       };
     } else {
       const normalizedValue = (() => {
@@ -2674,7 +2722,7 @@ export default function Tasks() {
 
       updatePayload = {
         [field]: normalizedValue,
-        updated_at: new Date().toISOString(),
+        updated_at: nowIso,
       };
     }
 
@@ -2719,25 +2767,23 @@ export default function Tasks() {
         const assignee = getUserByTelegramId(assigneeId);
         const assignerName = getUserFullName(assigner);
 
-        try {
-          await notifyAssignee({
-            assigneeUserId: assignee?.id || null,
-            title: `${title} (${status})`,
-            assignerName,
-            taskId,
-          });
-        } catch (notifyError) {
+        // Не ждем доставки уведомления: изменение уже сохранено,
+        // а обновление таблицы не должно зависеть от edge-функции.
+        notifyAssignee({
+          assigneeUserId: assignee?.id || null,
+          title: `${title} (${status})`,
+          assignerName,
+          taskId,
+        }).catch((notifyError) => {
           console.error("Уведомление не отправлено, но изменение задачи сохранено:", notifyError);
-        }
+        });
       }
     }
 
     if (field === "comments" && newComment && newComment !== oldComment) {
-      try {
-        await notifyTaskCommentParticipants({ task: originalTask, newComment });
-      } catch (notifyError) {
+      notifyTaskCommentParticipants({ task: originalTask, newComment }).catch((notifyError) => {
         console.error("Ошибка отправки уведомления о комментарии:", notifyError);
-      }
+      });
     }
 
     fetchTasks();
@@ -2802,15 +2848,6 @@ export default function Tasks() {
     return [...new Set(clients.map(c => c.primary_client).filter(Boolean))];
   }, [clients]);
 
-  // Опции статусов задач
-  const statusOptions = [
-    { value: "Выполняется", label: "В работе" },
-    { value: "Пауза", label: "Пауза" },
-    { value: "Просрочена", label: "Просрочена" },
-    { value: "Результат на согласовании", label: "Результат на согласовании" },
-    { value: "Завершено", label: "Завершено" }
-  ];
-
   // Функция для отображения детальной информации о задаче
   function renderTaskDetails(task) {
     const assigner = getUserByTelegramId(task.assigner_telegram_id);
@@ -2869,7 +2906,7 @@ export default function Tasks() {
                 value={status}
                 field="status"
                 type="select"
-                options={statusOptions}
+                options={STATUS_OPTIONS}
                 onEdit={(field, value, label, type, multiline, options) => 
                   handleFieldEdit(task.id, field, value, label, type, multiline, options)}
                 style={{ marginBottom: 16 }}
@@ -3160,7 +3197,7 @@ export default function Tasks() {
           clients={clients}
           branches={branches}
           primaryClients={uniquePrimaryClients}
-          statusOptions={statusOptions}
+          statusOptions={STATUS_OPTIONS}
         />
       )}
 
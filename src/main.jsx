@@ -1819,6 +1819,22 @@ const mobileInputStyle = {
   padding: "10px 12px",
 };
 
+// Пункты навигации статичны — нет смысла пересоздавать массивы на каждый рендер.
+const desktopNavItems = [
+  { key: "tasks", label: "Задачи" },
+  { key: "clients", label: "Клиенты" },
+  { key: "branches", label: "Филиалы" },
+  { key: "sellout", label: "SELL-OUT" },
+];
+const mobileNavItems = [
+  { key: "today", label: "Сегодня" },
+  { key: "tasks", label: "Задачи" },
+  { key: "clients", label: "Клиенты" },
+  { key: "branches", label: "Филиалы" },
+  { key: "sellout", label: "SELL-OUT" },
+  { key: "inbox", label: "Уведомл." },
+];
+
 function AppShell({ onLogout }) {
   const [page, setPage] = useState(() => {
     if (typeof window === "undefined") return "tasks";
@@ -1879,21 +1895,6 @@ function AppShell({ onLogout }) {
     }
   }
 
-  const desktopNavItems = [
-    { key: "tasks", label: "Задачи" },
-    { key: "clients", label: "Клиенты" },
-    { key: "branches", label: "Филиалы" },
-    { key: "sellout", label: "SELL-OUT" },
-  ];
-  const mobileNavItems = [
-    { key: "today", label: "Сегодня" },
-    { key: "tasks", label: "Задачи" },
-    { key: "clients", label: "Клиенты" },
-    { key: "branches", label: "Филиалы" },
-    { key: "sellout", label: "SELL-OUT" },
-    { key: "inbox", label: "Уведомл." },
-  ];
-
   useEffect(() => {
     if (!isMobile) return;
     if (!["today", "tasks", "clients", "branches", "sellout", "inbox"].includes(page)) {
@@ -1906,7 +1907,7 @@ function AppShell({ onLogout }) {
     if (!isMobile) return;
     setInboxLoading(true);
     try {
-      const [eventsRes, tasksRes, clientsRes, usersRes, branchesRes, profileRes] = await Promise.all([
+      const [eventsRes, tasksRes, clientsRes, usersRes, branchesRes] = await Promise.all([
         supabase
           .from("task_events")
           .select("id, event_type, payload, created_at")
@@ -1932,11 +1933,6 @@ function AppShell({ onLogout }) {
           .select("id, name, primary_client, city, responsible, responsible_id, strategy_plan, branch_birthday, visit_date, trading_hall, training, director, ns_rp, ns_op, ns_kp, ns_smo, mpp, top_clients_sds, top_clients_branch, upcoming_events, new_products, catalogs_samples, comments, task_info, created_at, updated_at")
           .order("name", { ascending: true })
           .limit(200),
-        supabase
-          .from("users")
-          .select("id, telegram_id, role, primary_client, first_name, last_name, username")
-          .eq("id", localStorage.getItem("currentUserId") || "")
-          .maybeSingle(),
       ]);
 
       if (!eventsRes.error) setInboxItems(eventsRes.data || []);
@@ -1944,7 +1940,24 @@ function AppShell({ onLogout }) {
       if (!clientsRes.error) setMobileClients(clientsRes.data || []);
       if (!usersRes.error) setMobileUsers(usersRes.data || []);
       if (!branchesRes.error) setMobileBranches(branchesRes.data || []);
-      if (!profileRes.error) setCurrentUserProfile(profileRes.data || null);
+
+      // Профиль текущего пользователя берем из уже загруженного списка users,
+      // чтобы не делать отдельный запрос к той же таблице.
+      if (!usersRes.error) {
+        const currentUserId = String(localStorage.getItem("currentUserId") || "");
+        const ownProfile = (usersRes.data || []).find((user) => String(user.id) === currentUserId) || null;
+        if (ownProfile) {
+          setCurrentUserProfile(ownProfile);
+        } else if (currentUserId) {
+          // Страховка: пользователь мог не попасть в limit(200) — дочитываем точечно.
+          const profileRes = await supabase
+            .from("users")
+            .select("id, telegram_id, role, primary_client, first_name, last_name, username")
+            .eq("id", currentUserId)
+            .maybeSingle();
+          if (!profileRes.error) setCurrentUserProfile(profileRes.data || null);
+        }
+      }
 
       if (!tasksRes.error) {
         const now = new Date();
@@ -2003,10 +2016,13 @@ function AppShell({ onLogout }) {
 
     const assignerUser = findUserByTelegramId(originalTask.assigner_telegram_id);
     const assigneeUser = findUserByTelegramId(originalTask.assignee_telegram_id);
-    const recipients = [assignerUser, assigneeUser]
-      .filter(Boolean)
-      .filter((user, index, arr) => arr.findIndex((u) => String(u.id) === String(user.id)) === index)
-      .filter((user) => String(user.id || "") !== authorUserId);
+    const recipientsById = new Map(
+      [assignerUser, assigneeUser]
+        .filter(Boolean)
+        .map((user) => [String(user.id), user])
+    );
+    recipientsById.delete(authorUserId);
+    const recipients = [...recipientsById.values()];
 
     if (!recipients.length) return;
 
@@ -2029,6 +2045,9 @@ function AppShell({ onLogout }) {
 
   async function quickUpdateTaskStatus(taskId, nextStatus) {
     if (!taskId || !nextStatus) return;
+    // Статус уже такой — не гоняем update и полный refreshMobileData впустую.
+    const currentTask = (mobileTasks || []).find((task) => task.id === taskId);
+    if (currentTask && currentTask.status === nextStatus) return;
     try {
       const { error } = await supabase
         .from("tasks")
@@ -2121,10 +2140,14 @@ function AppShell({ onLogout }) {
         console.error("saveTaskFromMobile failed:", error);
         return false;
       }
-      if (nextComment && nextComment !== oldComment) {
-        await notifyTaskCommentParticipantsMobile({ originalTask, nextComment });
-      }
-      await refreshMobileData();
+      // Уведомление и обновление данных не зависят друг от друга —
+      // запускаем их параллельно, а не последовательно.
+      await Promise.all([
+        nextComment && nextComment !== oldComment
+          ? notifyTaskCommentParticipantsMobile({ originalTask, nextComment })
+          : Promise.resolve(),
+        refreshMobileData(),
+      ]);
       return true;
     } catch (error) {
       console.error("saveTaskFromMobile exception:", error);